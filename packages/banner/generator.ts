@@ -236,11 +236,19 @@ export class BannerGenerator {
     const minFontSize = 16;
     const lineHeight = 1.3;
     
-    // Binary search for optimal font size
-    let bestFontSize = minFontSize;
-    let bestLines: string[] = [];
+    const step = 2;
     
-    for (let fontSize = maxFontSize; fontSize >= minFontSize; fontSize -= 2) {
+    // Binary search for the largest font size (in steps of 2px) whose wrapped
+    // lines fit the area; wrapped height only grows with font size
+    let bestFontSize = minFontSize;
+    ctx.font = `${minFontSize}px INTER_BOLD, Arial, sans-serif`;
+    let bestLines: string[] = this.wrapText(ctx, title, area.width);
+    
+    let low = 1;
+    let high = Math.floor((maxFontSize - minFontSize) / step);
+    while (low <= high) {
+      const mid = Math.floor((low + high) / 2);
+      const fontSize = minFontSize + mid * step;
       ctx.font = `${fontSize}px INTER_BOLD, Arial, sans-serif`;
       
       const lines = this.wrapText(ctx, title, area.width);
@@ -249,7 +257,9 @@ export class BannerGenerator {
       if (totalHeight <= area.height) {
         bestFontSize = fontSize;
         bestLines = lines;
-        break;
+        low = mid + 1;
+      } else {
+        high = mid - 1;
       }
     }
     
@@ -333,10 +343,15 @@ export function createBannerGenerator(fontDir?: string): BannerGenerator {
   return new BannerGenerator(fontDir);
 }
 
+// Shared generator so fonts are registered once per process, not per banner
+let defaultGenerator: BannerGenerator | null = null;
+
 /**
  * Main function to generate banner PNG
  */
 export async function generateBannerPNG(input: BannerInput): Promise<string> {
-  const generator = createBannerGenerator();
-  return generator.generateBannerPNG(input);
+  if (!defaultGenerator) {
+    defaultGenerator = createBannerGenerator();
+  }
+  return defaultGenerator.generateBannerPNG(input);
 } 
\ No newline at end of file
@@ -0,0 +1,77 @@
+import { spawn } from 'child_process';
+
+/**
+ * ffmpeg arguments for one H.264 encoder: device setup placed before the inputs,
+ * a filter appended to the end of the video graph, and the codec settings.
+ *
+ * railway-backend.js is plain Node and cannot import this module, so it keeps a
+ * JavaScript copy of the table and probe; change both together.
+ */
+export interface VideoEncoder {
+  inputArgs: string[];
+  filter: string;
+  codecArgs: string[];
+}
+
+const VAAPI_DEVICE = process.env.VAAPI_DEVICE || '/dev/dri/renderD128';
+
+/**
+ * H.264 encoders in order of preference. Hardware encoders may need the frames
+ * uploaded to the device first, which is what `filter` does for VAAPI.
+ */
+export const VIDEO_ENCODERS: Record<string, VideoEncoder> = {
+  h264_nvenc: {
+    inputArgs: [],
+    filter: '',
+    codecArgs: ['-c:v', 'h264_nvenc', '-preset', 'p4', '-cq', '20', '-profile:v', 'high', '-pix_fmt', 'yuv420p']
+  },
+  h264_vaapi: {
+    inputArgs: ['-vaapi_device', VAAPI_DEVICE],
+    filter: 'format=nv12,hwupload',
+    codecArgs: ['-c:v', 'h264_vaapi', '-qp', '20', '-profile:v', 'high']
+  },
+  libx264: {
+    inputArgs: [],
+    filter: '',
+    codecArgs: ['-c:v', 'libx264', '-preset', 'fast', '-crf', '20', '-profile:v', 'high', '-level', '4.1', '-pix_fmt', 'yuv420p']
+  }
+};
+
+/**
+ * ffmpeg lists nvenc/vaapi even without a usable device, so an encoder only
+ * counts as available if a tiny test encode with it succeeds
+ */
+function probeVideoEncoder(name: string): Promise<boolean> {
+  const encoder = VIDEO_ENCODERS[name];
+  const args = ['-hide_banner', '-loglevel', 'error', ...encoder.inputArgs, '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1'];
+  if (encoder.filter) args.push('-vf', encoder.filter);
+  args.push(...encoder.codecArgs, '-f', 'null', '-');
+  return new Promise((resolve) => {
+    const ff = spawn('ffmpeg', args);
+    ff.on('close', (code) => resolve(code === 0));
+    ff.on('error', () => resolve(false));
+  });
+}
+
+let videoEncoderPromise: Promise<VideoEncoder> | null = null;
+
+/**
+ * The first working encoder, probed once and cached for the life of the process
+ * (VIDEO_ENCODER forces one)
+ */
+export function getVideoEncoder(): Promise<VideoEncoder> {
+  if (!videoEncoderPromise) {
+    videoEncoderPromise = (async () => {
+      const forced = process.env.VIDEO_ENCODER;
+      if (forced && VIDEO_ENCODERS[forced]) return forced;
+      for (const name of ['h264_nvenc', 'h264_vaapi']) {
+        if (await probeVideoEncoder(name)) return name;
+      }
+      return 'libx264';
+    })().then((name) => {
+      console.log(`🎞️ Using video encoder: ${name}`);
+      return VIDEO_ENCODERS[name];
+    });
+  }
+  return videoEncoderPromise;
+}
@@ -1,9 +1,15 @@
 const express = require('express');
 const cors = require('cors');
 const path = require('path');
+const os = require('os');
 const fs = require('fs');
 const fsp = require('fs/promises');
-const { v4: uuidv4 } = require('uuid');
+const crypto = require('crypto');
+const cluster = require('cluster');
+const { EventEmitter } = require('events');
+const { spawn } = require('child_process');
+const { Readable } = require('stream');
+const { pipeline } = require('stream/promises');
 
 console.log('Railway backend script started.'); // Added log
 
@@ -12,21 +18,75 @@ const PORT = process.env.PORT || 3000;
 
 console.log(`Attempting to start server on port: ${PORT}`); // Added log
 
+// Positive integer from the environment; unset, zero, negative or non-numeric
+// values fall back to the default instead of turning into 0 or NaN
+function positiveIntEnv(name, fallback) {
+  const value = parseInt(process.env[name] || '', 10);
+  return value > 0 ? value : fallback;
+}
+
+// Job state only survives across processes when it lives in Redis, so the API is
+// forked into WEB_CONCURRENCY workers only when REDIS_URL is configured.
+const WEB_CONCURRENCY = positiveIntEnv('WEB_CONCURRENCY', 1);
+const isClusterPrimary = Boolean(process.env.REDIS_URL) && WEB_CONCURRENCY > 1 && cluster.isPrimary;
+
 // In-memory video status storage (for simplicity)
 const videoStatus = new Map();
+// Emits (videoId, status) whenever this process updates a video's status
+const videoEvents = new EventEmitter();
+videoEvents.setMaxListeners(0);
+// When each video rendered by this process finished, in completion order
+const videoFinishedAt = new Map();
+const VIDEO_TTL_MS = positiveIntEnv('VIDEO_TTL_SECONDS', 3600) * 1000;
+// Hard cap on finished videos kept per rendering process, so a burst within one TTL
+// cannot grow the status map or the videos directory without bound
+const MAX_TRACKED_VIDEOS = positiveIntEnv('MAX_TRACKED_VIDEOS', 10000);
+
+// JSON responses are small, per-request status payloads; skip hashing each body
+// for an ETag (sendFile keeps its own stat-based ETags for videos)
+app.set('etag', false);
 
 // Middleware
 app.use(cors());
-app.use(express.json({ limit: '50mb' }));
-app.use(express.static('public'));
+// Only the generate endpoint takes a body; story text fits comfortably in 1mb
+const jsonBody = express.json({ limit: '1mb' });
 
-// Ensure videos directory exists
+// Ensure videos directory exists (created once, then reused)
+let videosDirReady = null;
 async function ensureVideosDir() {
   const videosDir = path.join(__dirname, 'public', 'videos');
-  await fsp.mkdir(videosDir, { recursive: true });
+  if (!videosDirReady) {
+    videosDirReady = fsp.mkdir(videosDir, { recursive: true });
+    videosDirReady.catch(() => { videosDirReady = null; });
+  }
+  await videosDirReady;
   return videosDir;
 }
 
+// Filenames present in public/videos, built once at startup and kept current as
+// renders finish and expire, so /videos can reject unknown names without a stat
+const videoFiles = new Set();
+try {
+  for (const name of fs.readdirSync(path.join(__dirname, 'public', 'videos'))) {
+    if (name.endsWith('.mp4')) videoFiles.add(name);
+  }
+} catch {}
+
+// Bundled backgrounds (public/backgrounds/<category>/1.mp4) ship with the image and
+// never change at runtime, so they are indexed once here instead of stat'ed per render
+const localBackgrounds = new Map();
+try {
+  const backgroundsRoot = path.join(__dirname, 'public', 'backgrounds');
+  for (const category of fs.readdirSync(backgroundsRoot)) {
+    const candidate = path.join(backgroundsRoot, category, '1.mp4');
+    if (fs.existsSync(candidate)) localBackgrounds.set(category, candidate);
+  }
+} catch {}
+
+function resolveLocalBg(category) {
+  return localBackgrounds.get(category) || null;
+}
+
 // Pick a sample background mp4 to copy (kept for reference/local assets)
 async function resolveSampleMp4(preferredCategory) {
   const backgroundsRoot = path.join(__dirname, 'public', 'backgrounds');
@@ -53,8 +113,8 @@ async function resolveSampleMp4(preferredCategory) {
 }
 
 // Health check endpoint
+// Hit by Railway's healthcheck every few seconds, so it does no I/O (not even a log line)
 app.get('/api/health', (req, res) => {
-  console.log('Health check requested.'); // Added log
   res.json({
     status: 'healthy',
     timestamp: new Date().toISOString(),
@@ -73,6 +133,11 @@ app.get('/', (req, res) => {
   );
 });
 
+// Render pipeline for /generate-video. 'remotion' renders every frame through a
+// headless browser; 'ffmpeg' composes background, banner, captions and audio in a
+// single ffmpeg process, which is much cheaper per video.
+const RENDER_ENGINE = (process.env.RENDER_ENGINE || 'remotion').toLowerCase();
+
 // External background mapping (replace with your own CDN later)
 const EXTERNAL_BG = {
   minecraft: process.env.BG_MINECRAFT_URL || 'https://interactive-examples.mdn.mozilla.net/media/cc0-videos/flower.mp4',
@@ -83,6 +148,59 @@ const EXTERNAL_BG = {
   random: process.env.BG_RANDOM_URL || 'https://interactive-examples.mdn.mozilla.net/media/cc0-videos/flower.mp4'
 };
 
+// Remote backgrounds are the same file for every video in a category, so each URL
+// is downloaded once into tmp/ and reused by later renders instead of refetched.
+const backgroundDownloads = new Map();
+function downloadBackground(url) {
+  let pending = backgroundDownloads.get(url);
+  if (!pending) {
+    pending = (async () => {
+      const tmpDir = path.join(__dirname, 'tmp');
+      await fsp.mkdir(tmpDir, { recursive: true });
+      const bgPath = path.join(tmpDir, `bg-${crypto.createHash('sha1').update(url).digest('hex')}.mp4`);
+      // A previous process may already have downloaded it
+      if (await fsp.access(bgPath).then(() => true, () => false)) return bgPath;
+      const bgRes = await fetch(url);
+      if (!bgRes.ok) throw new Error(`Background download failed ${bgRes.status}: ${url}`);
+      // Stream to disk under a private name (never holding the whole clip in memory)
+      // and rename so other renders never see a partial file
+      const partPath = `${bgPath}.${process.pid}.part`;
+      try {
+        await pipeline(Readable.fromWeb(bgRes.body), fs.createWriteStream(partPath));
+      } catch (err) {
+        await fsp.unlink(partPath).catch(() => {});
+        throw err;
+      }
+      await fsp.rename(partPath, bgPath);
+      return bgPath;
+    })();
+    pending.catch(() => backgroundDownloads.delete(url));
+    backgroundDownloads.set(url, pending);
+  }
+  return pending;
+}
+
+// Background clip for a render: the category's remote URL if one is configured,
+// else the first bundled clip among the category and its fallbacks, else the
+// random remote clip. Callers start this before their TTS requests and await it
+// later; the no-op catch only keeps a failure from surfacing as an unhandled
+// rejection if the caller throws before awaiting (the caller still sees it).
+function resolveBackground(category, fallbacks = []) {
+  const bgReady = (async () => {
+    const preferredRemote = EXTERNAL_BG[category] || null;
+    if (preferredRemote && preferredRemote.startsWith('http')) {
+      return downloadBackground(preferredRemote);
+    }
+    for (const candidate of [category, ...fallbacks]) {
+      const local = resolveLocalBg(candidate);
+      if (local) return local;
+    }
+    return downloadBackground(EXTERNAL_BG.random);
+  })();
+  bgReady.catch(() => {});
+  return bgReady;
+}
+
 // Azure TTS (Cognitive Services)
 const AZURE_TTS_KEY = process.env.AZURE_TTS_KEY;
 const AZURE_TTS_REGION = process.env.AZURE_TTS_REGION; // e.g., eastus, westus2
@@ -97,6 +215,29 @@ const AZURE_VOICE_MAP = {
   rachel: 'en-US-AmberNeural'
 };
 
+// Narration is deterministic for a given voice and text, so recent syntheses are
+// kept in a small LRU keyed by a hash of both and repeat requests skip the TTS call.
+const TTS_CACHE_SIZE = positiveIntEnv('TTS_CACHE_SIZE', 32);
+const ttsCache = new Map();
+
+// Return the cached audio for key, or run synthesize() and cache its result
+async function withTtsCache(key, synthesize) {
+  const cacheKey = crypto.createHash('sha1').update(key).digest('hex');
+  const cached = ttsCache.get(cacheKey);
+  if (cached) {
+    // Re-insert so the entry becomes most recently used
+    ttsCache.delete(cacheKey);
+    ttsCache.set(cacheKey, cached);
+    return cached;
+  }
+  const buf = await synthesize();
+  ttsCache.set(cacheKey, buf);
+  if (ttsCache.size > TTS_CACHE_SIZE) {
+    ttsCache.delete(ttsCache.keys().next().value);
+  }
+  return buf;
+}
+
 async function synthesizeVoiceAzure(text, voiceAlias, genderHint) {
   if (!AZURE_TTS_KEY || !AZURE_TTS_REGION) {
     console.warn('Azure TTS not configured (AZURE_TTS_KEY/AZURE_TTS_REGION missing). Skipping TTS.');
@@ -109,31 +250,79 @@ async function synthesizeVoiceAzure(text, voiceAlias, genderHint) {
     voiceName = genderHint === 'female' ? 'en-US-AriaNeural' : 'en-US-GuyNeural';
   }
 
-  const endpoint = `https://${AZURE_TTS_REGION}.tts.speech.microsoft.com/cognitiveservices/v1`;
-  const ssml = `<?xml version="1.0" encoding="UTF-8"?>\n<speak version="1.0" xml:lang="en-US">\n  <voice name="${voiceName}">${text}</voice>\n</speak>`;
-
-  const resp = await fetch(endpoint, {
-    method: 'POST',
-    headers: {
-      'Ocp-Apim-Subscription-Key': AZURE_TTS_KEY,
-      'Content-Type': 'application/ssml+xml',
-      'X-Microsoft-OutputFormat': 'audio-24khz-160kbitrate-mono-mp3',
-      'User-Agent': 'adhd-story-gen'
-    },
-    body: ssml
+  return withTtsCache(`${voiceName}\n${text}`, async () => {
+    const endpoint = `https://${AZURE_TTS_REGION}.tts.speech.microsoft.com/cognitiveservices/v1`;
+    const ssml = `<?xml version="1.0" encoding="UTF-8"?>\n<speak version="1.0" xml:lang="en-US">\n  <voice name="${voiceName}">${text}</voice>\n</speak>`;
+
+    const resp = await fetch(endpoint, {
+      method: 'POST',
+      headers: {
+        'Ocp-Apim-Subscription-Key': AZURE_TTS_KEY,
+        'Content-Type': 'application/ssml+xml',
+        'X-Microsoft-OutputFormat': 'audio-24khz-160kbitrate-mono-mp3',
+        'User-Agent': 'adhd-story-gen'
+      },
+      body: ssml
+    });
+    if (!resp.ok) {
+      const t = await resp.text();
+      throw new Error(`Azure TTS error ${resp.status}: ${t}`);
+    }
+    return Buffer.from(await resp.arrayBuffer());
   });
-  if (!resp.ok) {
-    const t = await resp.text();
-    throw new Error(`Azure TTS error ${resp.status}: ${t}`);
+}
+
+// ElevenLabs TTS (used by the Remotion renderer)
+const ELEVENLABS_API_KEY = process.env.ELEVENLABS_API_KEY;
+
+// Same voice ids as the Next.js app (src/lib/video-generator/voice.ts)
+const ELEVEN_VOICE_MAP = {
+  brian: 'nPczCjzI2devNBz1zQrb',
+  adam: 'pNInz6obpgDQGcFmaJgB',
+  antoni: 'ErXwobaYiN019PkySvjV',
+  sarah: 'EXAVITQu4vr4xnSDxMaL',
+  laura: 'FGY2WhTYpPnrIDTdsKH5',
+  rachel: '21m00Tcm4TlvDq8ikWAM'
+};
+
+async function synthesizeVoiceEleven(text, voiceAlias) {
+  if (!ELEVENLABS_API_KEY) {
+    console.warn('ElevenLabs TTS not configured (ELEVENLABS_API_KEY missing). Skipping TTS.');
+    return null;
   }
-  const buf = Buffer.from(await resp.arrayBuffer());
-  return buf;
+
+  const voiceId = ELEVEN_VOICE_MAP[voiceAlias] || ELEVEN_VOICE_MAP.adam;
+  return withTtsCache(`eleven:${voiceId}\n${text}`, async () => {
+    const resp = await fetch(`https://api.elevenlabs.io/v1/text-to-speech/${voiceId}`, {
+      method: 'POST',
+      headers: {
+        'xi-api-key': ELEVENLABS_API_KEY,
+        'Content-Type': 'application/json',
+        'Accept': 'audio/mpeg'
+      },
+      body: JSON.stringify({
+        text,
+        model_id: 'eleven_multilingual_v2',
+        // Same settings as src/lib/video-generator/voice.ts so narration sounds alike
+        voice_settings: {
+          stability: 0.75,
+          similarity_boost: 0.85,
+          style: 0.35,
+          use_speaker_boost: true
+        }
+      })
+    });
+    if (!resp.ok) {
+      const t = await resp.text();
+      throw new Error(`ElevenLabs TTS error ${resp.status}: ${t}`);
+    }
+    return Buffer.from(await resp.arrayBuffer());
+  });
 }
 
 // Helpers to get audio duration with ffprobe and build word timestamps
 async function getAudioDurationFromFile(audioPath) {
   return new Promise((resolve, reject) => {
-    const { spawn } = require('child_process');
     const ffprobe = spawn('ffprobe', ['-v', 'quiet', '-show_entries', 'format=duration', '-of', 'csv=p=0', audioPath]);
     let output = '';
     ffprobe.stdout.on('data', (d) => (output += d.toString()));
@@ -145,6 +334,75 @@ async function getAudioDurationFromFile(audioPath) {
   });
 }
 
+// H.264 encoder selection. This is a plain-Node copy of the table and probe in
+// packages/shared/video-encoder.ts (the Next.js side imports that module); change
+// both together. Only the quality presets differ on purpose: this server trades
+// some quality (veryfast/23) for throughput.
+const VAAPI_DEVICE = process.env.VAAPI_DEVICE || '/dev/dri/renderD128';
+const VIDEO_ENCODERS = {
+  h264_nvenc: {
+    inputArgs: [],
+    filter: '',
+    codecArgs: ['-c:v', 'h264_nvenc', '-preset', 'p1', '-cq', '23', '-pix_fmt', 'yuv420p']
+  },
+  h264_vaapi: {
+    inputArgs: ['-vaapi_device', VAAPI_DEVICE],
+    filter: 'format=nv12,hwupload',
+    codecArgs: ['-c:v', 'h264_vaapi', '-qp', '23']
+  },
+  libx264: {
+    inputArgs: [],
+    filter: '',
+    codecArgs: ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23', '-pix_fmt', 'yuv420p']
+  }
+};
+
+function probeVideoEncoder(name) {
+  const encoder = VIDEO_ENCODERS[name];
+  const args = ['-hide_banner', '-loglevel', 'error', ...encoder.inputArgs, '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1'];
+  if (encoder.filter) args.push('-vf', encoder.filter);
+  args.push(...encoder.codecArgs, '-f', 'null', '-');
+  return new Promise((resolve) => {
+    const ff = spawn('ffmpeg', args);
+    ff.on('close', (code) => resolve(code === 0));
+    ff.on('error', () => resolve(false));
+  });
+}
+
+let videoEncoderPromise = null;
+function getVideoEncoder() {
+  if (!videoEncoderPromise) {
+    videoEncoderPromise = (async () => {
+      const forced = process.env.VIDEO_ENCODER;
+      if (forced && VIDEO_ENCODERS[forced]) return forced;
+      for (const name of ['h264_nvenc', 'h264_vaapi']) {
+        if (await probeVideoEncoder(name)) return name;
+      }
+      return 'libx264';
+    })().then((name) => {
+      console.log(`Using video encoder: ${name}`);
+      return name;
+    });
+  }
+  return videoEncoderPromise;
+}
+
+// Cores available to one render. In cluster mode every one of the WEB_CONCURRENCY
+// forks runs its own worker with RENDER_CONCURRENCY slots, so the machine may be
+// rendering WEB_CONCURRENCY x RENDER_CONCURRENCY videos at once.
+function coresPerRender() {
+  const forks = REDIS_URL && WEB_CONCURRENCY > 1 ? WEB_CONCURRENCY : 1;
+  return Math.max(1, Math.floor(os.cpus().length / (forks * RENDER_CONCURRENCY)));
+}
+
+// Encoder threads per ffmpeg run: FFMPEG_THREADS if set, otherwise the cores
+// split evenly between concurrent renders so one render can use the whole box
+function ffmpegThreads() {
+  const forced = parseInt(process.env.FFMPEG_THREADS || '', 10);
+  if (forced > 0) return forced;
+  return coresPerRender();
+}
+
 function buildWordTimestamps(totalDuration, text) {
   const words = (text || '').split(/\s+/).filter((w) => w.length > 0);
   if (words.length === 0 || !isFinite(totalDuration) || totalDuration <= 0) return [];
@@ -152,77 +410,57 @@ function buildWordTimestamps(totalDuration, text) {
   return words.map((w, i) => ({ text: w, start: i * avg, end: (i + 1) * avg }));
 }
 
+// Banner image (overlay during opening) and caption font are static assets, so
+// resolve them once at startup rather than probing the filesystem per render.
+// Prefer the centered card banner; an empty string means none was found.
+const COMPOSE_BANNER_PATH = [
+  path.join(__dirname, 'public', 'banners', 'redditbannerbottom.png'),
+  path.join(__dirname, 'public', 'banners', 'redditbannertop.png')
+].find((p) => fs.existsSync(p)) || '';
+const CAPTION_FONT_PATH = [
+  '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+  '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+  '/System/Library/Fonts/Helvetica.ttc',
+  '/Windows/Fonts/arial.ttf'
+].find((f) => fs.existsSync(f)) || '';
+
 async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAlias }, videoId) {
   const videosDir = await ensureVideosDir();
   const outPath = path.join(videosDir, `${videoId}.mp4`);
 
-  // Resolve BG (remote env URL preferred, else local public/backgrounds/<cat>/1.mp4, else fallback)
-  function resolveLocalBg(category) {
-    const p = path.join(__dirname, 'public', 'backgrounds', category, '1.mp4');
-    return fs.existsSync(p) ? p : null;
-  }
-  const preferredRemote = EXTERNAL_BG[backgroundCategory] || null;
-  let bgPath;
   const tmpDir = path.join(__dirname, 'tmp');
   await fsp.mkdir(tmpDir, { recursive: true });
-  if (preferredRemote && preferredRemote.startsWith('http')) {
-    bgPath = path.join(tmpDir, `bg-${videoId}.mp4`);
-    const bgRes = await fetch(preferredRemote);
-    const bgBuf = Buffer.from(await bgRes.arrayBuffer());
-    await fsp.writeFile(bgPath, bgBuf);
-  } else {
-    bgPath = resolveLocalBg(backgroundCategory) || resolveLocalBg('subway') || resolveLocalBg('minecraft');
-    if (!bgPath) {
-      bgPath = path.join(tmpDir, `bg-${videoId}.mp4`);
-      const fallback = EXTERNAL_BG.random;
-      const bgRes = await fetch(fallback);
-      const bgBuf = Buffer.from(await bgRes.arrayBuffer());
-      await fsp.writeFile(bgPath, bgBuf);
-    }
-  }
 
-  // Synthesize TTS for title and story segments
+  // Resolve BG (remote env URL preferred, else local public/backgrounds/<cat>/1.mp4, else fallback)
+  const bgReady = resolveBackground(backgroundCategory, ['subway', 'minecraft']);
+
+  // Synthesize TTS for title and story segments. The background download and both
+  // TTS requests are independent network calls, so they run concurrently.
   const openingText = title || '';
   const storyText = (story || '').split('[BREAK]')[0].trim() || story || '';
-  const openingBuf = await synthesizeVoiceAzure(openingText, voiceAlias, undefined).catch(() => null);
-  const storyBuf = await synthesizeVoiceAzure(storyText, voiceAlias, undefined).catch(() => null);
+  const [bgPath, openingBuf, storyBuf] = await Promise.all([
+    bgReady,
+    synthesizeVoiceAzure(openingText, voiceAlias, undefined).catch(() => null),
+    synthesizeVoiceAzure(storyText, voiceAlias, undefined).catch(() => null)
+  ]);
 
-  // Write audio to files
+  // Write audio to files and probe durations
   const openingAudio = path.join(tmpDir, `open-${videoId}.mp3`);
   const storyAudio = path.join(tmpDir, `story-${videoId}.mp3`);
-  if (openingBuf) await fsp.writeFile(openingAudio, openingBuf);
-  if (storyBuf) await fsp.writeFile(storyAudio, storyBuf);
-
-  // Durations
-  const openingDur = openingBuf ? await getAudioDurationFromFile(openingAudio) : 0.8;
-  const storyDur = storyBuf ? await getAudioDurationFromFile(storyAudio) : 3.0;
+  const [openingDur, storyDur] = await Promise.all([
+    openingBuf ? fsp.writeFile(openingAudio, openingBuf).then(() => getAudioDurationFromFile(openingAudio)) : 0.8,
+    storyBuf ? fsp.writeFile(storyAudio, storyBuf).then(() => getAudioDurationFromFile(storyAudio)) : 3.0
+  ]);
 
   // Word timestamps for captions
   const wordTimestamps = buildWordTimestamps(storyDur, storyText);
 
-  // Banner image (overlay during opening). Prefer centered card asset
-  let bannerPath = path.join(__dirname, 'public', 'banners', 'redditbannerbottom.png');
-  if (!fs.existsSync(bannerPath)) {
-    bannerPath = path.join(__dirname, 'public', 'banners', 'redditbannertop.png');
-  }
-
-  // Font fallback
-  let fontPath = '';
-  const candidates = [
-    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
-    '/System/Library/Fonts/Helvetica.ttc',
-    '/Windows/Fonts/arial.ttf'
-  ];
-  for (const f of candidates) {
-    try { if (fs.existsSync(f)) { fontPath = f; break; } } catch {}
-  }
-
-  const { spawn } = require('child_process');
+  const bannerPath = COMPOSE_BANNER_PATH;
+  const fontPath = CAPTION_FONT_PATH;
 
   // Build filter_complex: scale+crop to 1080x1920, overlay banner during opening, draw per-word captions.
   let filter = `[0:v]scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920,eq=brightness=0.05:contrast=1.1:saturation=1.1[bg];`;
-  const bannerExists = fs.existsSync(bannerPath);
+  const bannerExists = Boolean(bannerPath);
   if (bannerExists) {
     // Scale banner and center slightly lower than midpoint during opening
     filter += `[1:v]scale=900:-1[banner];[bg][banner]overlay=(main_w-w)/2:(main_h-h)/2+120:enable='between(t,0,${openingDur.toFixed(2)})'[v0]`;
@@ -242,8 +480,10 @@ async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAli
     current = `t${i}`;
   });
 
+  const encoder = VIDEO_ENCODERS[await getVideoEncoder()];
+
   // Prepare inputs and determine indexes
-  const args = ['-y', '-i', bgPath];
+  const args = ['-y', ...encoder.inputArgs, '-i', bgPath];
   let idx = 1;
   const bannerIdx = bannerExists ? idx++ : -1;
   const openingIdx = openingBuf ? idx++ : -1;
@@ -267,6 +507,12 @@ async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAli
     filter += `;[${storyIdx}:a]aformat=sample_fmts=fltp:channel_layouts=stereo,aresample=44100,asetpts=PTS-STARTPTS[aout]`;
   }
 
+  // Hardware encoders may need the frames uploaded to the device first
+  if (encoder.filter) {
+    filter += `;[${current}]${encoder.filter}[venc]`;
+    current = 'venc';
+  }
+
   // Apply single filter_complex and proper mapping
   args.push(
     '-filter_complex', filter,
@@ -274,15 +520,20 @@ async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAli
   );
   if (haveAudio) args.push('-map', '[aout]');
 
+  // Only set up the AAC encoder when there is narration to encode
+  const audioArgs = haveAudio ? ['-c:a', 'aac', '-b:a', '128k', '-ar', '44100'] : ['-an'];
   args.push(
-    '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23',
-    '-c:a', 'aac', '-b:a', '128k', '-ar', '44100',
-    '-r', '30', '-pix_fmt', 'yuv420p', '-shortest', outPath
+    ...encoder.codecArgs,
+    ...audioArgs,
+    '-threads', String(ffmpegThreads()),
+    '-r', '30', '-shortest', outPath
   );
 
   console.log('FFMPEG FILTER_COMPLEX =>', filter);
   console.log('FFMPEG ARGS =>', JSON.stringify(args));
 
+  // Complete means both narration segments and the full banner/caption graph made it in
+  let complete = Boolean(openingBuf && storyBuf);
   try {
     await new Promise((resolve, reject) => {
       const ff = spawn('ffmpeg', args);
@@ -292,6 +543,7 @@ async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAli
     });
   } catch (err) {
     console.error('Primary ffmpeg graph failed, falling back to simple compose:', err.message);
+    complete = false;
     // Fallback: background + concatenated audio, no banner/captions
     const fallbackArgs = ['-y', '-i', bgPath];
     let fallbackAudioIdx = -1;
@@ -309,7 +561,13 @@ async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAli
       fallbackArgs.push('-map', '0:v');
     }
 
-    fallbackArgs.push('-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23', '-c:a', 'aac', '-b:a', '128k', '-ar', '44100', '-r', '30', '-pix_fmt', 'yuv420p', '-shortest', outPath);
+    fallbackArgs.push('-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23');
+    if (audioInputs.length > 0) {
+      fallbackArgs.push('-c:a', 'aac', '-b:a', '128k', '-ar', '44100');
+    } else {
+      fallbackArgs.push('-an');
+    }
+    fallbackArgs.push('-threads', String(ffmpegThreads()), '-r', '30', '-pix_fmt', 'yuv420p', '-shortest', outPath);
 
     console.log('FFMPEG FALLBACK FILTER =>', fallbackFilter);
     console.log('FFMPEG FALLBACK ARGS =>', JSON.stringify(fallbackArgs));
@@ -322,80 +580,53 @@ async function buildVideoWithFfmpeg({ title, story, backgroundCategory, voiceAli
     });
   }
 
-  return `/videos/${videoId}.mp4`;
+  return { videoUrl: `/videos/${videoId}.mp4`, complete };
 }
 
-// Simple video generation function
-async function generateVideoSimple(options, videoId) {
-  console.log(`Generating video for ID: ${videoId} with options:`, options); // Added log
-  videoStatus.set(videoId, { status: 'processing', progress: 0, message: 'Video generation started.' });
-
-  await new Promise((r) => setTimeout(r, 300));
-  videoStatus.set(videoId, { status: 'processing', progress: 25, message: 'Generating voice-over...' });
-  await new Promise((r) => setTimeout(r, 300));
-  videoStatus.set(videoId, { status: 'processing', progress: 50, message: 'Compositing video...' });
-  await new Promise((r) => setTimeout(r, 300));
-  videoStatus.set(videoId, { status: 'processing', progress: 75, message: 'Finalizing...' });
-
-  try {
-    const videoUrl = await buildVideoWithFfmpeg({
-      title: options?.customStory?.title,
-      story: options?.customStory?.story,
-      backgroundCategory: options?.background?.category || 'random',
-      voiceAlias: options?.voice?.id
-    }, videoId);
-
-    videoStatus.set(videoId, { status: 'completed', progress: 100, message: 'Video generation complete.', videoUrl });
-    console.log(`Video generation completed for ID: ${videoId}`);
-  } catch (err) {
-    console.error('Video build failed:', err);
-    videoStatus.set(videoId, { status: 'failed', error: 'Video build failed' });
+// Remotion renderer setup (use Remotion instead of hybrid/efficient generator).
+// The bundler pulls in webpack, so it is only required on the first Remotion
+// render; RENDER_ENGINE=ffmpeg processes and the cluster primary never load it.
+const {renderMedia} = require('@remotion/renderer');
+
+// Bundling runs a full webpack build of the renderer project; its output does
+// not depend on the job, so build it once per process and reuse the serve URL
+let remotionBundlePromise = null;
+function getRemotionBundle() {
+  if (!remotionBundlePromise) {
+    const {bundle} = require('@remotion/bundler');
+    const entry = path.join(__dirname, 'apps', 'renderer', 'src', 'index.ts');
+    console.log('Bundling Remotion project from', entry);
+    remotionBundlePromise = bundle(entry);
+    remotionBundlePromise.catch(() => { remotionBundlePromise = null; });
   }
+  return remotionBundlePromise;
 }
 
-// Remotion renderer setup (use Remotion instead of hybrid/efficient generator)
-const {bundle, renderMedia, getCompositions} = require('@remotion/renderer');
-const os = require('os');
-
 async function generateVideoWithRemotion({ title, story, backgroundCategory, voiceAlias }, videoId) {
   const tmpDir = path.join(__dirname, 'tmp');
   await fsp.mkdir(tmpDir, { recursive: true });
 
   // 1) Resolve inputs (banner, background, audio)
   // Background
-  const preferredRemote = EXTERNAL_BG[backgroundCategory] || null;
-  let bgPath;
-  if (preferredRemote && preferredRemote.startsWith('http')) {
-    bgPath = path.join(tmpDir, `bg-${videoId}.mp4`);
-    const bgRes = await fetch(preferredRemote);
-    const bgBuf = Buffer.from(await bgRes.arrayBuffer());
-    await fsp.writeFile(bgPath, bgBuf);
-  } else {
-    const local = path.join(__dirname, 'public', 'backgrounds', backgroundCategory || 'subway', '1.mp4');
-    if (fs.existsSync(local)) bgPath = local; else {
-      bgPath = path.join(tmpDir, `bg-${videoId}.mp4`);
-      const fallback = EXTERNAL_BG.random;
-      const bgRes = await fetch(fallback);
-      const bgBuf = Buffer.from(await bgRes.arrayBuffer());
-      await fsp.writeFile(bgPath, bgBuf);
-    }
-  }
+  const bgReady = resolveBackground(backgroundCategory || 'subway');
 
   // Banner
-  let bannerPath = path.join(__dirname, 'public', 'banners', 'redditbannerbottom.png');
-  if (!fs.existsSync(bannerPath)) {
-    bannerPath = path.join(__dirname, 'public', 'banners', 'redditbannertop.png');
-  }
+  const bannerPath = COMPOSE_BANNER_PATH;
 
-  // Audio via ElevenLabs (optional)
+  // Audio via ElevenLabs (optional), fetched concurrently with the background
   const openingText = title || '';
   const storyText = (story || '').split('[BREAK]')[0].trim() || story || '';
-  const openingBuf = await synthesizeVoiceEleven(openingText, voiceAlias).catch(() => null);
-  const storyBuf = await synthesizeVoiceEleven(storyText, voiceAlias).catch(() => null);
+  const [bgPath, openingBuf, storyBuf] = await Promise.all([
+    bgReady,
+    synthesizeVoiceEleven(openingText, voiceAlias).catch(() => null),
+    synthesizeVoiceEleven(storyText, voiceAlias).catch(() => null)
+  ]);
   const openingAudio = path.join(tmpDir, `open-${videoId}.mp3`);
   const storyAudio = path.join(tmpDir, `story-${videoId}.mp3`);
-  if (openingBuf) await fsp.writeFile(openingAudio, openingBuf);
-  if (storyBuf) await fsp.writeFile(storyAudio, storyBuf);
+  await Promise.all([
+    openingBuf && fsp.writeFile(openingAudio, openingBuf),
+    storyBuf && fsp.writeFile(storyAudio, storyBuf)
+  ]);
 
   // Pick narration source (prefer story)
   const narrationPath = storyBuf ? storyAudio : (openingBuf ? openingAudio : null);
@@ -414,10 +645,8 @@ async function generateVideoWithRemotion({ title, story, backgroundCategory, voi
     }));
   }
 
-  // 2) Bundle the Remotion project
-  const entry = path.join(__dirname, 'apps', 'renderer', 'src', 'index.ts');
-  console.log('Bundling Remotion project from', entry);
-  const bundled = await bundle(entry);
+  // 2) Bundle the Remotion project (cached after the first render)
+  const bundled = await getRemotionBundle();
 
   // Determine duration in frames based on audio length (fallback 60s)
   const fps = 30;
@@ -444,9 +673,11 @@ async function generateVideoWithRemotion({ title, story, backgroundCategory, voi
     },
     serveUrl: bundled,
     codec: 'h264',
+    // Share the cores between concurrent renders instead of Remotion's default of half
+    concurrency: coresPerRender(),
     outputLocation: outPath,
     inputProps: {
-      bannerPng: fs.existsSync(bannerPath) ? bannerPath : '',
+      bannerPng: bannerPath,
       bgVideo: bgPath,
       narrationWav: narrationPath || '',
       alignment,
@@ -457,34 +688,236 @@ async function generateVideoWithRemotion({ title, story, backgroundCategory, voi
     }
   });
 
-  return `/videos/${videoId}.mp4`;
+  // Without both narration segments the video is silent or partial
+  return { videoUrl: `/videos/${videoId}.mp4`, complete: Boolean(openingBuf && storyBuf) };
+}
+
+// Identical inputs render identical videos when every step succeeds, so complete
+// renders are kept in a small content-addressed cache and repeats are hard-linked
+// instead of re-encoded
+const RENDER_CACHE_DIR = path.join(__dirname, 'tmp', 'render-cache');
+const RENDER_CACHE_SIZE = positiveIntEnv('RENDER_CACHE_SIZE', 50);
+const renderCache = new Map(); // cache key -> cached file path, least recently used first
+
+// Rebuild the cache index from disk at startup so it survives restarts. Each
+// file's mtime records when it was last used (hits touch it), which restores
+// the LRU order without a separate index file for processes to race on.
+try {
+  const cached = fs.readdirSync(RENDER_CACHE_DIR)
+    .filter((name) => name.endsWith('.mp4'))
+    .map((name) => {
+      const filePath = path.join(RENDER_CACHE_DIR, name);
+      return { key: path.basename(name, '.mp4'), filePath, mtimeMs: fs.statSync(filePath).mtimeMs };
+    })
+    .sort((a, b) => a.mtimeMs - b.mtimeMs);
+  for (const { key, filePath } of cached) renderCache.set(key, filePath);
+} catch {}
+
+function renderCacheKey(job) {
+  // Background URLs come from BG_*_URL, so a redeploy with new URLs must miss;
+  // the random URL is included because both builders fall back to it
+  const inputs = [
+    RENDER_ENGINE, job.title, job.story, job.backgroundCategory, job.voiceAlias,
+    EXTERNAL_BG[job.backgroundCategory] || null, EXTERNAL_BG.random
+  ];
+  return crypto.createHash('sha1').update(JSON.stringify(inputs)).digest('hex');
+}
+
+async function linkOrCopy(src, dest) {
+  try {
+    await fsp.link(src, dest);
+  } catch {
+    // Reflink (copy-on-write) where supported, otherwise a kernel-side copy
+    await fsp.copyFile(src, dest, fs.constants.COPYFILE_FICLONE);
+  }
+}
+
+// Link a cached render to outPath; false if there is none (or it has gone missing)
+async function reuseCachedRender(key, outPath) {
+  const cachedPath = renderCache.get(key);
+  if (!cachedPath) return false;
+  try {
+    await linkOrCopy(cachedPath, outPath);
+  } catch {
+    renderCache.delete(key);
+    return false;
+  }
+  renderCache.delete(key);
+  renderCache.set(key, cachedPath);
+  const now = new Date();
+  await fsp.utimes(cachedPath, now, now).catch(() => {});
+  return true;
+}
+
+async function cacheRender(key, outPath) {
+  await fsp.mkdir(RENDER_CACHE_DIR, { recursive: true });
+  const cachedPath = path.join(RENDER_CACHE_DIR, `${key}.mp4`);
+  await fsp.unlink(cachedPath).catch(() => {});
+  await linkOrCopy(outPath, cachedPath);
+  renderCache.set(key, cachedPath);
+  while (renderCache.size > RENDER_CACHE_SIZE) {
+    const [oldestKey, oldestPath] = renderCache.entries().next().value;
+    renderCache.delete(oldestKey);
+    await fsp.unlink(oldestPath).catch(() => {});
+  }
+}
+
+function setVideoStatus(videoId, status) {
+  videoStatus.set(videoId, status);
+  videoEvents.emit(videoId, status);
+}
+
+// Run a single render job and record its outcome in videoStatus
+async function runRenderJob(videoId, job) {
+  const render = RENDER_ENGINE === 'ffmpeg' ? buildVideoWithFfmpeg : generateVideoWithRemotion;
+  try {
+    const cacheKey = renderCacheKey(job);
+    const outPath = path.join(await ensureVideosDir(), `${videoId}.mp4`);
+    let videoUrl;
+    if (await reuseCachedRender(cacheKey, outPath)) {
+      console.log(`Reused cached render for ${videoId}`);
+      videoUrl = `/videos/${videoId}.mp4`;
+    } else {
+      const result = await render(job, videoId);
+      videoUrl = result.videoUrl;
+      // Degraded renders (TTS failed, fallback compose) must not be replayed for
+      // later identical requests, so only complete ones enter the cache
+      if (result.complete) {
+        await cacheRender(cacheKey, outPath).catch((err) => console.warn('Could not cache render:', err.message));
+      }
+    }
+    videoFiles.add(`${videoId}.mp4`);
+    setVideoStatus(videoId, { status: 'completed', progress: 100, message: 'Video generation complete.', videoUrl });
+    trackFinishedVideo(videoId);
+    return videoUrl;
+  } catch (e) {
+    console.error('Background generation failed:', e);
+    setVideoStatus(videoId, { status: 'failed', error: 'Video build failed' });
+    trackFinishedVideo(videoId);
+    throw e;
+  }
+}
+
+// Optional Redis-backed render queue. With REDIS_URL set, /generate-video enqueues
+// the job (keyed by videoId) and a BullMQ worker renders it, so job state lives in
+// Redis and can be read by any process, not just the one that accepted the request.
+const REDIS_URL = process.env.REDIS_URL;
+const RENDER_QUEUE_NAME = 'video-render';
+const RENDER_CONCURRENCY = positiveIntEnv('RENDER_CONCURRENCY', 1);
+let renderQueue = null;
+if (REDIS_URL && !isClusterPrimary) {
+  const { Queue, Worker } = require('bullmq');
+  const IORedis = require('ioredis');
+  const connection = new IORedis(REDIS_URL, { maxRetriesPerRequest: null });
+  renderQueue = new Queue(RENDER_QUEUE_NAME, { connection });
+  if (process.env.RENDER_WORKER !== '0') {
+    const worker = new Worker(RENDER_QUEUE_NAME, (job) => runRenderJob(job.id, job.data), {
+      connection,
+      concurrency: RENDER_CONCURRENCY
+    });
+    worker.on('error', (err) => console.error('Render worker error:', err));
+  }
+  console.log(`Render queue enabled (concurrency ${RENDER_CONCURRENCY})`);
+}
+
+// Without Redis, renders wait in an in-memory FIFO and at most RENDER_CONCURRENCY
+// run at once, so a burst of requests cannot start unbounded parallel encodes
+const localRenderQueue = [];
+let localRendersActive = 0;
+
+function enqueueLocalRender(videoId, job) {
+  localRenderQueue.push({ videoId, job });
+  drainLocalRenders();
+}
+
+function drainLocalRenders() {
+  while (localRendersActive < RENDER_CONCURRENCY && localRenderQueue.length > 0) {
+    const { videoId, job } = localRenderQueue.shift();
+    localRendersActive++;
+    setVideoStatus(videoId, { status: 'processing', progress: 0, message: 'Rendering video...' });
+    runRenderJob(videoId, job)
+      .catch(() => {})
+      .finally(() => {
+        localRendersActive--;
+        drainLocalRenders();
+      });
+  }
+}
+
+// Translate a queued job's state into the /video-status payload
+async function getQueuedVideoStatus(videoId) {
+  const job = await renderQueue.getJob(videoId);
+  if (!job) return null;
+  const state = await job.getState();
+  if (state === 'completed') {
+    return { status: 'completed', progress: 100, message: 'Video generation complete.', videoUrl: job.returnvalue };
+  }
+  if (state === 'failed') {
+    return { status: 'failed', error: 'Video build failed' };
+  }
+  return {
+    status: 'processing',
+    progress: typeof job.progress === 'number' ? job.progress : 0,
+    message: state === 'active' ? 'Rendering video...' : 'Queued for rendering.'
+  };
+}
+
+// Video ids: millisecond timestamp followed by 64 random bits, so ids sort by creation time
+function newVideoId() {
+  return Date.now().toString(16).padStart(12, '0') + crypto.randomBytes(8).toString('hex');
+}
+
+// Validate the request body up front and keep only the fields a render uses.
+// Returns null when a field has the wrong type, so bad input fails before it is queued.
+function parseRenderJob(body) {
+  const customStory = body?.customStory ?? {};
+  const voice = body?.voice ?? {};
+  const background = body?.background ?? {};
+  if (typeof customStory !== 'object' || typeof voice !== 'object' || typeof background !== 'object') {
+    return null;
+  }
+  const { title = '', story = '' } = customStory;
+  const { category = '' } = background;
+  const { id = '' } = voice;
+  if (typeof title !== 'string' || typeof story !== 'string' || typeof category !== 'string' || typeof id !== 'string') {
+    return null;
+  }
+  // The category becomes part of a filesystem path
+  if (!/^[\w-]*$/.test(category)) {
+    return null;
+  }
+  return {
+    title,
+    story,
+    backgroundCategory: category || 'random',
+    voiceAlias: id || 'adam'
+  };
 }
 
 // Video generation endpoint
-app.post('/generate-video', async (req, res) => {
+app.post('/generate-video', jsonBody, async (req, res) => {
 	try {
 		console.log('Received video generation request.'); // Added log
-		const { customStory, voice, background, isCliffhanger } = req.body;
-		const videoId = uuidv4();
-
-		// Set initial processing status so /video-status does not 404
-		videoStatus.set(videoId, { status: 'processing', progress: 0, message: 'Video generation started.' });
-
-		// Start video generation in the background (Remotion-only)
-		(async () => {
-			try {
-				const videoUrl = await generateVideoWithRemotion({
-					title: customStory?.title || '',
-					story: customStory?.story || '',
-					backgroundCategory: background?.category || 'random',
-					voiceAlias: voice?.id || 'adam'
-				}, videoId);
-				videoStatus.set(videoId, { status: 'completed', progress: 100, message: 'Video generation complete.', videoUrl });
-			} catch (e) {
-				console.error('Background generation failed:', e);
-				videoStatus.set(videoId, { status: 'failed', error: 'Video build failed' });
-			}
-		})();
+		const job = parseRenderJob(req.body);
+		if (!job) {
+			return res.status(400).json({ success: false, error: 'Invalid video generation request' });
+		}
+		const videoId = newVideoId();
+
+		// Hand the job to the queue, or render it in the background in-process.
+		// Queued jobs are tracked in Redis, which /video-status reads first; only
+		// local renders need an initial status here so /video-status does not 404.
+		if (renderQueue) {
+			await renderQueue.add('render', job, {
+				jobId: videoId,
+				// Backstop for jobs whose rendering process died before expiring them
+				removeOnComplete: { age: VIDEO_TTL_MS / 1000 },
+				removeOnFail: { age: VIDEO_TTL_MS / 1000 }
+			});
+		} else {
+			setVideoStatus(videoId, { status: 'processing', progress: 0, message: 'Video generation started.' });
+			enqueueLocalRender(videoId, job);
+		}
 
 		res.status(202).json({ success: true, message: 'Video generation started.', videoId, statusUrl: `/video-status/${videoId}` });
 	} catch (error) {
@@ -507,7 +940,11 @@ app.get('/video-status/:videoId', async (req, res) => {
   try {
     const { videoId } = req.params;
     console.log(`Video status requested for ID: ${videoId}`); // Added log
-    const status = videoStatus.get(videoId);
+    // Redis is authoritative when queued: the job may be rendered by another process
+    let status = renderQueue ? await getQueuedVideoStatus(videoId) : null;
+    if (!status) {
+      status = videoStatus.get(videoId);
+    }
 
     if (!status) {
       return res.status(404).json({ success: false, error: 'Video ID not found.' });
@@ -520,21 +957,194 @@ app.get('/video-status/:videoId', async (req, res) => {
   }
 });
 
+// Push status changes over Server-Sent Events so clients need not poll. Local
+// renders are pushed as they happen; queued jobs (which may render in another
+// process) are checked in Redis once a second and sent only when they change.
+app.get(['/video-events/:videoId', '/api/video-events/:videoId'], async (req, res) => {
+  try {
+    const { videoId } = req.params;
+    const readStatus = async () => (renderQueue ? await getQueuedVideoStatus(videoId) : null) || videoStatus.get(videoId);
+    const initial = await readStatus();
+    if (!initial) {
+      return res.status(404).json({ success: false, error: 'Video ID not found.' });
+    }
+
+    res.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive'
+    });
+
+    let lastSent = '';
+    let timer = null;
+    let closed = false;
+    // Renders can go minutes without a status change; a comment line every 20s
+    // keeps idle-timeout proxies from cutting the stream
+    const heartbeat = setInterval(() => res.write(':\n\n'), 20000);
+    const close = () => {
+      if (closed) return;
+      closed = true;
+      videoEvents.off(videoId, send);
+      if (timer) clearInterval(timer);
+      clearInterval(heartbeat);
+      res.end();
+    };
+    function send(status) {
+      if (closed || !status) return;
+      const data = JSON.stringify(status);
+      if (data !== lastSent) {
+        lastSent = data;
+        res.write(`data: ${data}\n\n`);
+      }
+      if (status.status !== 'processing') close();
+    }
+
+    videoEvents.on(videoId, send);
+    req.on('close', close);
+    if (renderQueue) {
+      timer = setInterval(() => {
+        readStatus().then(send).catch(() => {});
+      }, 1000);
+    }
+    send(initial);
+  } catch (error) {
+    console.error('Video events error:', error);
+    if (!res.headersSent) {
+      res.status(500).json({ success: false, error: error.message || 'Failed to stream video status' });
+    } else {
+      res.end();
+    }
+  }
+});
+
+// Let a fronting nginx serve video bytes (X-Accel-Redirect) instead of Node
+const USE_X_ACCEL = process.env.USE_X_ACCEL === '1';
+const X_ACCEL_PREFIX = process.env.X_ACCEL_PREFIX || '/_videos/';
+
 // Serve generated videos
 app.get('/videos/:filename', (req, res) => {
   const filename = req.params.filename;
+  // Express decodes %2F in params, so only names in the id format may reach the
+  // filesystem; anything else could resolve outside public/videos
+  if (!/^[0-9a-f]+\.mp4$/.test(filename)) {
+    return res.status(404).json({ error: 'Video not found' });
+  }
   const videoPath = path.join(__dirname, 'public', 'videos', filename);
-  
-  if (fs.existsSync(videoPath)) {
-    res.sendFile(videoPath);
-  } else {
-    res.status(404).json({ error: 'Video not found' });
+
+  // With a render queue another process may have written the file, so only
+  // trust a miss in the index when this process renders everything itself
+  if (!videoFiles.has(filename) && !renderQueue) {
+    return res.status(404).json({ error: 'Video not found' });
+  }
+
+  // Behind nginx, hand the transfer to the proxy: it maps X_ACCEL_PREFIX to
+  // public/videos in an internal location and streams the file with sendfile
+  if (USE_X_ACCEL) {
+    res.set({
+      'X-Accel-Redirect': `${X_ACCEL_PREFIX}${encodeURIComponent(filename)}`,
+      'Content-Type': 'video/mp4',
+      'Cache-Control': 'public, max-age=31536000, immutable'
+    });
+    return res.end();
   }
-});
 
-// Start the server
-app.listen(PORT, () => {
-  console.log(`🚀 Railway backend server running on port ${PORT}`); // Added log
+  // sendFile streams from disk with range support and stats the file itself,
+  // so a missing video surfaces as an ENOENT error instead of a separate check.
+  // Video ids are random and never reused, so clients may cache them forever.
+  // Reads use 1 MiB chunks instead of the 64 KiB default to cut syscalls.
+  res.sendFile(videoPath, { acceptRanges: true, maxAge: '1y', immutable: true, highWaterMark: 1 << 20 }, (err) => {
+    if (err && !res.headersSent) {
+      if (err.statusCode === 404 || err.code === 'ENOENT') {
+        res.status(404).json({ error: 'Video not found' });
+      } else {
+        res.status(500).json({ error: 'Failed to serve video' });
+      }
+    }
+  });
 });
 
+// Other public assets; registered after /videos so it does not shadow that route
+app.use(express.static('public'));
+
+// Forget a finished video and delete its file. In queue mode the job is removed
+// too, since /video-status reads Redis first and would keep reporting the video.
+async function expireVideo(videoId) {
+  videoFinishedAt.delete(videoId);
+  videoStatus.delete(videoId);
+  videoFiles.delete(`${videoId}.mp4`);
+  if (renderQueue) {
+    await renderQueue.remove(videoId).catch(() => {});
+  }
+  await fsp.unlink(path.join(__dirname, 'public', 'videos', `${videoId}.mp4`)).catch(() => {});
+}
+
+// Expiry is owned by the process that rendered the video: it wrote the file and
+// the only local status entry, and it knows when the render actually finished.
+// Past MAX_TRACKED_VIDEOS the oldest finished videos are expired early; every
+// entry here is finished, so the cap is a hard bound on this process's map.
+function trackFinishedVideo(videoId) {
+  videoFinishedAt.delete(videoId);
+  videoFinishedAt.set(videoId, Date.now());
+  for (const oldId of videoFinishedAt.keys()) {
+    if (videoFinishedAt.size <= MAX_TRACKED_VIDEOS) break;
+    expireVideo(oldId);
+  }
+}
+
+// A queued job may be picked up again (e.g. after a stalled worker), so in queue
+// mode Redis decides whether a video is still rendering, not the local map
+async function isRendering(videoId) {
+  if (renderQueue) {
+    const status = await getQueuedVideoStatus(videoId).catch(() => null);
+    if (status) return status.status === 'processing';
+  }
+  return videoStatus.get(videoId)?.status === 'processing';
+}
+
+// Expire videos VIDEO_TTL_SECONDS after they finished rendering so the status map
+// and the videos directory do not grow without bound
+async function sweepExpiredVideos() {
+  const cutoff = Date.now() - VIDEO_TTL_MS;
+  for (const [videoId, finishedAt] of videoFinishedAt) {
+    if (finishedAt > cutoff) break;
+    if (await isRendering(videoId)) continue;
+    await expireVideo(videoId);
+  }
+}
+setInterval(() => {
+  sweepExpiredVideos().catch((err) => console.error('Video sweep failed:', err));
+}, Math.min(VIDEO_TTL_MS, 5 * 60 * 1000)).unref();
+
+// Start the server (or, in cluster mode, the workers that each run it)
+if (isClusterPrimary) {
+  console.log(`Forking ${WEB_CONCURRENCY} server workers`);
+  // A worker that dies within QUICK_EXIT_MS most likely failed at startup (bad env,
+  // port in use), so restarts back off exponentially and the primary gives up after
+  // MAX_QUICK_EXITS in a row instead of fork/crash looping
+  const QUICK_EXIT_MS = 10000;
+  const MAX_QUICK_EXITS = 5;
+  const forkedAt = new Map();
+  let quickExits = 0;
+  const forkWorker = () => forkedAt.set(cluster.fork().id, Date.now());
+  for (let i = 0; i < WEB_CONCURRENCY; i++) forkWorker();
+  cluster.on('exit', (worker, code, signal) => {
+    const uptime = Date.now() - forkedAt.get(worker.id);
+    forkedAt.delete(worker.id);
+    quickExits = uptime < QUICK_EXIT_MS ? quickExits + 1 : 0;
+    if (quickExits >= MAX_QUICK_EXITS) {
+      console.error(`Server workers keep exiting at startup (${quickExits} in a row), giving up`);
+      process.exit(1);
+    }
+    const delay = quickExits > 0 ? Math.min(1000 * 2 ** (quickExits - 1), 30000) : 0;
+    console.error(`Server worker ${worker.process.pid} exited (${signal || code}), restarting in ${delay}ms`);
+    setTimeout(forkWorker, delay);
+  });
+} else {
+  app.listen(PORT, () => {
+    console.log(`🚀 Railway backend server running on port ${PORT}`); // Added log
+    // Probe hardware encoders up front so the first render does not pay for it
+    getVideoEncoder();
+  });
+}
+
 module.exports = app; 
\ No newline at end of file
@@ -1,7 +1,8 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { setVideoGenerating, updateProgress, setVideoReady, setVideoFailed } from '@/lib/video-generator/status';
 import { v4 as uuidv4 } from 'uuid';
-import { generateVideo } from '@/lib/video-generator/moviepy-generator';
+import path from 'path';
+import { generateVideo } from '@/lib/video-generator/efficient-generator';
 
 export async function POST(request: NextRequest) {
   const videoId = uuidv4();
@@ -15,7 +16,7 @@ export async function POST(request: NextRequest) {
     // Set initial status
     await setVideoGenerating(videoId);
 
-    // Start async video generation using the working MoviePy system to test banner changes
+    // Start async video generation using the direct FFmpeg generator to test banner changes
     generateTestVideo({
       background,
     }, videoId).catch(error => {
@@ -53,7 +54,7 @@ async function generateTestVideo(
     console.log('🚀 Starting test video generation with updated banner layout...');
     await updateProgress(videoId, 5);
 
-    // Create the VideoGenerationOptions format that moviepy-generator expects
+    // Create the VideoGenerationOptions format that efficient-generator expects
     const testStoryOptions = {
       story: {
         title: "Updated Banner Layout Test - Left Aligned Title",
@@ -92,7 +93,9 @@ async function generateTestVideo(
     await updateProgress(videoId, 10);
 
     console.log('🎬 Generating video with updated banner layout...');
-    const videoUrl = await generateVideo(testStoryOptions, videoId);
+    // The generator composes in a single FFmpeg pass and writes to the tmp dir served by /api/videos
+    const outputPath = await generateVideo(testStoryOptions, videoId);
+    const videoUrl = `/api/videos/${path.basename(outputPath)}`;
 
     await setVideoReady(videoId, videoUrl);
     console.log('✅ Test video generation completed successfully with updated banner!');
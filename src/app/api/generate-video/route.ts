@@ -19,16 +19,13 @@ async function generateVideoOnRailway(options: VideoOptions, videoId: string, st
     throw new Error('Missing RAILWAY_API_URL environment variable');
   }
 
+  // Only send the fields the Railway renderer reads
   const railwayRequest = {
-    subreddit: story.subreddit,
-    isCliffhanger: options.isCliffhanger,
-    voice: options.voice,
-    background: options.background,
+    voice: { id: options.voice.id },
+    background: { category: options.background.category },
     customStory: {
       title: story.title,
-      story: story.story,
-      subreddit: story.subreddit,
-      author: story.author
+      story: story.story
     }
   };
 
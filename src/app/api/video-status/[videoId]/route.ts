@@ -40,7 +40,7 @@ async function getRailwayVideoStatus(videoId: string) {
   }
 
   const result = await response.json();
-  console.log('Railway video status:', JSON.stringify(result, null, 2));
+  console.log(`Railway video status for ${videoId}: ${result.status}`);
   
   let status = toFrontendStatus(result.status);
   let progress = typeof result.progress === 'number' ? result.progress : (result.status === 'completed' ? 100 : 0);
@@ -112,7 +112,7 @@ export async function GET(
       }
     } else {
       // Return local status if found
-      console.log('Found local video status:', JSON.stringify(localStatus, null, 2));
+      console.log(`Found local video status for ${params.videoId}: ${localStatus.status}`);
       return new Response(JSON.stringify(localStatus), {
         status: 200,
         headers: {
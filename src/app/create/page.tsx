@@ -332,121 +332,158 @@ export default function Create() {
         return;
       }
 
-      console.log('Starting to poll for video status with ID:', data.videoId);
-
       // Start polling for video status
-      let pollCount = 0;
-      const maxPolls = 300; // 10 minutes timeout (300 * 2 seconds)
+      const startPolling = () => {
+        console.log('Starting to poll for video status with ID:', data.videoId);
+
+        let pollCount = 0;
+        const maxPolls = 300; // 10 minutes timeout (300 * 2 seconds)
       
-      const pollInterval = setInterval(async () => {
-        try {
-          pollCount++;
+        const pollInterval = setInterval(async () => {
+          try {
+            pollCount++;
           
-          // Timeout after 10 minutes
-          if (pollCount > maxPolls) {
-            clearInterval(pollInterval);
-            console.error('Video generation timed out after', maxPolls * 2, 'seconds');
-            setError('Video generation timed out. This might be due to high server load. Please try again.');
-            setIsGenerating(false);
-            setProgress(0);
-            return;
-          }
+            // Timeout after 10 minutes
+            if (pollCount > maxPolls) {
+              clearInterval(pollInterval);
+              console.error('Video generation timed out after', maxPolls * 2, 'seconds');
+              setError('Video generation timed out. This might be due to high server load. Please try again.');
+              setIsGenerating(false);
+              setProgress(0);
+              return;
+            }
 
-          console.log(`Polling video status (attempt ${pollCount}/${maxPolls})`);
+            console.log(`Polling video status (attempt ${pollCount}/${maxPolls})`);
           
-          let statusResponse;
-          try {
-            const API_BASE = process.env.NEXT_PUBLIC_RAILWAY_API_URL || '';
-            statusResponse = await fetch(`${API_BASE}/api/video-status/${data.videoId}`, {
-              method: 'GET',
-              cache: 'no-cache',
-              headers: {
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-              }
-            });
-          } catch (fetchError) {
-            console.error('Fetch error:', fetchError);
-            throw new Error(`Network error: ${fetchError instanceof Error ? fetchError.message : 'Unknown fetch error'}`);
-          }
+            let statusResponse;
+            try {
+              const API_BASE = process.env.NEXT_PUBLIC_RAILWAY_API_URL || '';
+              statusResponse = await fetch(`${API_BASE}/api/video-status/${data.videoId}`, {
+                method: 'GET',
+                cache: 'no-cache',
+                headers: {
+                  'Cache-Control': 'no-cache',
+                  'Pragma': 'no-cache'
+                }
+              });
+            } catch (fetchError) {
+              console.error('Fetch error:', fetchError);
+              throw new Error(`Network error: ${fetchError instanceof Error ? fetchError.message : 'Unknown fetch error'}`);
+            }
           
-          if (!statusResponse.ok) {
-            console.error('Status response not ok:', statusResponse.status, statusResponse.statusText);
-            throw new Error(`Failed to get video status: ${statusResponse.status} ${statusResponse.statusText}`);
-          }
+            if (!statusResponse.ok) {
+              console.error('Status response not ok:', statusResponse.status, statusResponse.statusText);
+              throw new Error(`Failed to get video status: ${statusResponse.status} ${statusResponse.statusText}`);
+            }
 
-          const statusData = await statusResponse.json();
-          console.log('Status data received:', JSON.stringify(statusData, null, 2));
+            const statusData = await statusResponse.json();
+            console.log('Status data received:', statusData);
           
-          // Always update progress if we have it
-          if (typeof statusData.progress === 'number') {
-            console.log('Updating progress from', progress, 'to', statusData.progress);
-            setProgress(statusData.progress);
-          }
+            // Always update progress if we have it
+            if (typeof statusData.progress === 'number') {
+              console.log('Updating progress from', progress, 'to', statusData.progress);
+              setProgress(statusData.progress);
+            }
           
-          // Handle different status cases
-          if (statusData.status === 'ready') {
-            console.log('✅ Video is ready!');
-            console.log('Video URL:', statusData.videoUrl);
-            console.log('Clearing interval and redirecting...');
-            clearInterval(pollInterval);
-            
-            // Add a small delay to ensure UI updates
-            setTimeout(() => {
-              // Redirect directly to the MP4 served by the worker
-              const API_BASE = process.env.NEXT_PUBLIC_RAILWAY_API_URL || '';
-              const target = statusData.videoUrl || `${API_BASE}/videos/${data.videoId}.mp4`;
-              console.log('Redirecting to:', target);
-              window.location.href = target;
-            }, 500);
+            // Handle different status cases
+            if (statusData.status === 'ready') {
+              console.log('✅ Video is ready!');
+              console.log('Video URL:', statusData.videoUrl);
+              console.log('Clearing interval and redirecting...');
+              clearInterval(pollInterval);
             
-          } else if (statusData.status === 'failed') {
-            console.error('❌ Video generation failed:', statusData.error);
-            clearInterval(pollInterval);
-            setError(`Video generation failed: ${statusData.error || 'Unknown error'}`);
-            setIsGenerating(false);
-            setProgress(0);
+              // Add a small delay to ensure UI updates
+              setTimeout(() => {
+                // Redirect directly to the MP4 served by the worker
+                const API_BASE = process.env.NEXT_PUBLIC_RAILWAY_API_URL || '';
+                const target = statusData.videoUrl || `${API_BASE}/videos/${data.videoId}.mp4`;
+                console.log('Redirecting to:', target);
+                window.location.href = target;
+              }, 500);
             
-          } else if (statusData.status === 'not_found') {
-            console.warn('⚠️ Video status not found');
-            // If status is not found after some time, it might indicate an issue
-            if (pollCount > 15) { // After 30 seconds
-              console.error('Video status lost after 30 seconds');
+            } else if (statusData.status === 'failed') {
+              console.error('❌ Video generation failed:', statusData.error);
               clearInterval(pollInterval);
-              setError('Video generation status lost. This might be a server issue. Please try again.');
+              setError(`Video generation failed: ${statusData.error || 'Unknown error'}`);
               setIsGenerating(false);
               setProgress(0);
-            }
             
-          } else if (statusData.status === 'generating') {
-            console.log('🔄 Video still generating, progress:', statusData.progress);
-            // Continue polling
+            } else if (statusData.status === 'not_found') {
+              console.warn('⚠️ Video status not found');
+              // If status is not found after some time, it might indicate an issue
+              if (pollCount > 15) { // After 30 seconds
+                console.error('Video status lost after 30 seconds');
+                clearInterval(pollInterval);
+                setError('Video generation status lost. This might be a server issue. Please try again.');
+                setIsGenerating(false);
+                setProgress(0);
+              }
             
-          } else {
-            console.warn('Unknown status:', statusData.status);
-          }
+            } else if (statusData.status === 'generating') {
+              console.log('🔄 Video still generating, progress:', statusData.progress);
+              // Continue polling
+            
+            } else {
+              console.warn('Unknown status:', statusData.status);
+            }
           
-        } catch (error) {
-          console.error('❌ Failed to poll video status:', error);
-          console.error('Error details:', {
-            message: error instanceof Error ? error.message : 'Unknown error',
-            stack: error instanceof Error ? error.stack : undefined,
-            pollCount,
-            videoId: data.videoId
-          });
+          } catch (error) {
+            console.error('❌ Failed to poll video status:', error);
+            console.error('Error details:', {
+              message: error instanceof Error ? error.message : 'Unknown error',
+              stack: error instanceof Error ? error.stack : undefined,
+              pollCount,
+              videoId: data.videoId
+            });
           
-          // Don't fail immediately on network errors, try a few more times
-          if (pollCount < 5) {
-            console.log('Retrying due to early error...');
-            return;
-          }
+            // Don't fail immediately on network errors, try a few more times
+            if (pollCount < 5) {
+              console.log('Retrying due to early error...');
+              return;
+            }
           
-          clearInterval(pollInterval);
-          setError(`Failed to check video status: ${error instanceof Error ? error.message : 'Unknown error'}. Please try again.`);
-          setIsGenerating(false);
-          setProgress(0);
-        }
-      }, 1000); // Poll every 1 second (faster polling)
+            clearInterval(pollInterval);
+            setError(`Failed to check video status: ${error instanceof Error ? error.message : 'Unknown error'}. Please try again.`);
+            setIsGenerating(false);
+            setProgress(0);
+          }
+        }, 2000); // Poll every 2 seconds (fallback when the event stream is unavailable)
+      };
+
+      // When talking to the Railway worker directly, subscribe to its event stream so
+      // status changes are pushed instead of polled; fall back to polling on any error
+      const EVENTS_BASE = process.env.NEXT_PUBLIC_RAILWAY_API_URL || '';
+      if (EVENTS_BASE && typeof EventSource !== 'undefined') {
+        const events = new EventSource(`${EVENTS_BASE}/api/video-events/${data.videoId}`);
+        let finished = false;
+        events.onmessage = (event) => {
+          const statusData = JSON.parse(event.data);
+          if (typeof statusData.progress === 'number') {
+            setProgress(statusData.progress);
+          }
+          if (statusData.status === 'completed') {
+            finished = true;
+            events.close();
+            const videoUrl: string = statusData.videoUrl || `/videos/${data.videoId}.mp4`;
+            window.location.href = videoUrl.startsWith('http') ? videoUrl : `${EVENTS_BASE}${videoUrl}`;
+          } else if (statusData.status === 'failed') {
+            finished = true;
+            events.close();
+            setError(`Video generation failed: ${statusData.error || 'Unknown error'}`);
+            setIsGenerating(false);
+            setProgress(0);
+          }
+        };
+        events.onerror = () => {
+          events.close();
+          if (!finished) {
+            console.warn('Video event stream unavailable, falling back to polling');
+            startPolling();
+          }
+        };
+      } else {
+        startPolling();
+      }
 
     } catch (error) {
       console.error('Failed to generate video:', error);
@@ -2,10 +2,15 @@ import { VideoGenerationOptions } from './types';
 import { generateSpeech, getAudioDuration } from './voice';
 import { updateProgress } from './status';
 import { generateBanner } from '../banner-generator';
+import { getVideoEncoder } from '../../../packages/shared/video-encoder';
 import path from 'path';
 import fs from 'fs/promises';
 import os from 'os';
 import { spawn } from 'child_process';
+import { createHash } from 'crypto';
+import { createWriteStream } from 'fs';
+import { Readable } from 'stream';
+import { pipeline } from 'stream/promises';
 
 interface WordTimestamp {
   text: string;
@@ -35,22 +40,26 @@ export async function generateVideo(
     const openingText = `${options.story.title}`;
     const storyText = options.story.story.split('[BREAK]')[0].trim();
 
-    const openingAudio = await generateSpeech({
-      text: openingText,
-      voice: options.voice,
-    });
-
-    const storyAudio = await generateSpeech({
-      text: storyText,
-      voice: options.voice,
-    });
+    // The two TTS requests are independent, so issue them together
+    const [openingAudio, storyAudio] = await Promise.all([
+      generateSpeech({
+        text: openingText,
+        voice: options.voice,
+      }),
+      generateSpeech({
+        text: storyText,
+        voice: options.voice,
+      }),
+    ]);
 
     // Save audio files
     const openingAudioPath = path.join(workingDir, 'opening.mp3');
     const storyAudioPath = path.join(workingDir, 'story.mp3');
     
-    await fs.writeFile(openingAudioPath, Buffer.from(openingAudio));
-    await fs.writeFile(storyAudioPath, Buffer.from(storyAudio));
+    await Promise.all([
+      fs.writeFile(openingAudioPath, Buffer.from(openingAudio)),
+      fs.writeFile(storyAudioPath, Buffer.from(storyAudio)),
+    ]);
 
     tempFiles.push(openingAudioPath, storyAudioPath);
 
@@ -59,40 +68,37 @@ export async function generateVideo(
 
     await updateProgress(videoId, 25);
 
-    // Generate dynamic banner
+    // Generate dynamic banner (kept in memory and piped to FFmpeg over stdin)
     console.log('🎨 Creating dynamic banner...');
-    const bannerImagePath = path.join(workingDir, 'banner.png');
+    let bannerBuffer: Buffer;
     
     try {
-      const bannerBuffer = await generateBanner({
+      bannerBuffer = await generateBanner({
         title: options.story.title,
         author: options.story.author,
         subreddit: options.story.subreddit,
         upvotes: Math.floor(Math.random() * 500 + 100),
         comments: Math.floor(Math.random() * 100 + 20),
       });
-      
-      // Write the buffer to file
-      await fs.writeFile(bannerImagePath, bannerBuffer);
       console.log('✅ Dynamic banner generated successfully');
     } catch (error) {
       console.log('⚠️ Dynamic banner failed, creating simple fallback');
       // Create a simple fallback PNG (1x1 transparent pixel)
-      const fallbackPng = Buffer.from(
+      bannerBuffer = Buffer.from(
         'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==',
         'base64'
       );
-      await fs.writeFile(bannerImagePath, fallbackPng);
     }
     
-    tempFiles.push(bannerImagePath);
     await updateProgress(videoId, 40);
 
     // Get word timestamps using simple approach
     console.log('⏱️ Getting word timestamps...');
     // Build word timestamps for both opening (title) and story, then merge with offsets so captions start at t=0
-    const openingWordTimestamps = await getWordTimestamps(openingAudioPath, openingText);
-    const storyWordTimestampsRaw = await getWordTimestamps(storyAudioPath, storyText);
+    const [openingWordTimestamps, storyWordTimestampsRaw] = await Promise.all([
+      getWordTimestamps(openingAudioPath, openingText),
+      getWordTimestamps(storyAudioPath, storyText),
+    ]);
     const wordTimestamps = [
       ...openingWordTimestamps.map(w => ({ ...w })),
       ...storyWordTimestampsRaw.map(w => ({ ...w, start: w.start + openingDuration, end: w.end + openingDuration }))
@@ -103,7 +109,7 @@ export async function generateVideo(
     console.log('🎬 Composing final video...');
     const outputPath = path.join(tmpDir, `efficient_output_${videoId}.mp4`);
     await composeEfficientVideo(
-      bannerImagePath,
+      bannerBuffer,
       openingAudioPath,
       storyAudioPath,
       options.background.category,
@@ -207,9 +213,89 @@ async function getAudioDurationFromFile(audioPath: string): Promise<number> {
   });
 }
 
+// Remote backgrounds are fetched once per URL and reused by later renders
+const backgroundDownloads = new Map<string, Promise<string>>();
+
+function downloadToTmp(url: string, name: string): Promise<string> {
+  let download = backgroundDownloads.get(url);
+  if (!download) {
+    download = (async () => {
+      const hash = createHash('sha1').update(url).digest('hex').slice(0, 16);
+      const out = path.join(os.tmpdir(), `${name}-${hash}.mp4`);
+      try {
+        await fs.access(out);
+        return out;
+      } catch {}
+      const resp = await fetch(url);
+      if (!resp.ok) throw new Error(`Failed to download background ${url}: ${resp.status}`);
+      if (!resp.body) throw new Error(`Empty background response for ${url}`);
+      // Stream to a temp name (never buffering the whole clip) so a concurrent
+      // render never sees a partial file
+      const partial = `${out}.${process.pid}.part`;
+      try {
+        await pipeline(Readable.fromWeb(resp.body as any), createWriteStream(partial));
+      } catch (error) {
+        await fs.unlink(partial).catch(() => {});
+        throw error;
+      }
+      await fs.rename(partial, out);
+      return out;
+    })();
+    backgroundDownloads.set(url, download);
+    // Let a failed download be retried by the next render
+    download.catch(() => backgroundDownloads.delete(url));
+  }
+  return download;
+}
+
+// Try to find a system font via fontconfig, fallback to common paths
+async function resolveFontFile(): Promise<string> {
+  const fromFontconfig = await new Promise<string>((resolve) => {
+    try {
+      const fc = spawn('fc-list', [':', 'file']);
+      let out = '';
+      fc.stdout.on('data', (d) => (out += d.toString()));
+      fc.on('close', () => {
+        const lines = out.split(/\r?\n/).map((l) => l.trim()).filter(Boolean);
+        const picked = lines.find((l) => /\.(ttf|ttc|otf)$/i.test(l));
+        if (picked) return resolve(picked);
+        resolve('');
+      });
+      fc.on('error', () => resolve(''));
+    } catch {
+      resolve('');
+    }
+  });
+  if (fromFontconfig) return fromFontconfig;
+
+  const possibleFonts = [
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/System/Library/Fonts/Helvetica.ttc',
+    '/System/Library/Fonts/Arial.ttf',
+    '/Windows/Fonts/arial.ttf'
+  ];
+  for (const font of possibleFonts) {
+    try {
+      await fs.access(font);
+      return font;
+    } catch {}
+  }
+  return '';
+}
+
+// Installed fonts don't change while the process runs, so look one up only once
+let captionFontPromise: Promise<string> | null = null;
+function getCaptionFont(): Promise<string> {
+  if (!captionFontPromise) {
+    captionFontPromise = resolveFontFile();
+  }
+  return captionFontPromise;
+}
+
 // Efficient video composition using FFmpeg (inspired by FullyAutomatedRedditVideoMakerBot)
 async function composeEfficientVideo(
-  bannerPath: string,
+  bannerPng: Buffer,
   openingAudio: string,
   storyAudio: string,
   backgroundCategory: string,
@@ -219,16 +305,6 @@ async function composeEfficientVideo(
   wordTimestamps: WordTimestamp[]
 ): Promise<void> {
   // Resolve background path
-  async function downloadToTmp(url: string, name: string): Promise<string> {
-    const tmpDir = os.tmpdir();
-    const out = path.join(tmpDir, `${name}-${Date.now()}.mp4`);
-    const resp = await fetch(url);
-    if (!resp.ok) throw new Error(`Failed to download background ${url}: ${resp.status}`);
-    const buf = await resp.arrayBuffer();
-    await fs.writeFile(out, Buffer.from(buf));
-    return out;
-  }
-
   const BG_URLS: Record<string, string | undefined> = {
     minecraft: process.env.BG_MINECRAFT_URL,
     subway: process.env.BG_SUBWAY_URL,
@@ -276,54 +352,23 @@ async function composeEfficientVideo(
       }
     }
   } catch (e) {
-    console.warn('[BG] error resolving background, falling back to sample:', (e as Error).message);
-    backgroundPath = await downloadToTmp('https://interactive-examples.mdn.mozilla.net/media/cc0-videos/flower.mp4', 'bg-sample2');
+    // Another download is likely to fail the same way; let FFmpeg synthesize a solid background
+    console.warn('[BG] error resolving background, falling back to solid color:', (e as Error).message);
+    backgroundPath = '';
   }
   
-  // Try to find a system font via fontconfig, fallback to common paths
-  async function resolveFontFile(): Promise<string> {
-    return new Promise((resolve) => {
-      try {
-        const fc = spawn('fc-list', [':', 'file']);
-        let out = '';
-        fc.stdout.on('data', (d) => (out += d.toString()));
-        fc.on('close', () => {
-          const lines = out.split(/\r?\n/).map((l) => l.trim()).filter(Boolean);
-          const picked = lines.find((l) => /\.(ttf|ttc|otf)$/i.test(l));
-          if (picked) return resolve(picked);
-          resolve('');
-        });
-        fc.on('error', () => resolve(''));
-      } catch {
-        resolve('');
-      }
-    });
-  }
-
-  let fontPath = await resolveFontFile();
-  if (!fontPath) {
-    const possibleFonts = [
-      '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-      '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
-      '/System/Library/Fonts/Helvetica.ttc',
-      '/System/Library/Fonts/Arial.ttf',
-      '/Windows/Fonts/arial.ttf'
-    ];
-    for (const font of possibleFonts) {
-      try {
-        await fs.access(font);
-        fontPath = font;
-        break;
-      } catch {}
-    }
-  }
+  const fontPath = await getCaptionFont();
+  const encoder = await getVideoEncoder();
 
   return new Promise((resolve, reject) => {
     // Build efficient FFmpeg command
     const ffmpegArgs = [
       '-y', // Overwrite output
-      '-i', backgroundPath, // Background video
-      '-i', bannerPath, // Banner image
+      ...encoder.inputArgs, // Hardware device setup, if any
+      ...(backgroundPath
+        ? ['-i', backgroundPath] // Background video
+        : ['-f', 'lavfi', '-i', 'color=c=black:s=1080x1920:r=30']), // Generated solid background
+      '-f', 'png_pipe', '-i', 'pipe:0', // Banner image (PNG bytes on stdin)
       '-i', openingAudio, // Opening audio
       '-i', storyAudio, // Story audio
     ];
@@ -363,6 +408,12 @@ async function composeEfficientVideo(
       currentInput = `text_${index}`;
     });
 
+    // Encoder-specific tail of the graph (e.g. VAAPI hwupload)
+    if (encoder.filter) {
+      filterComplex += `;[${currentInput}]${encoder.filter}[venc]`;
+      currentInput = 'venc';
+    }
+
     // Audio mixing
     filterComplex += `;[2:a]volume=1.0,afade=t=in:st=0:d=0.1,afade=t=out:st=${openingDuration-0.1}:d=0.1[opening_audio];[3:a]volume=1.0,afade=t=in:st=0:d=0.1,afade=t=out:st=${storyDuration-0.1}:d=0.1[story_audio];[opening_audio][story_audio]concat=n=2:v=0:a=1[final_audio]`;
 
@@ -370,13 +421,8 @@ async function composeEfficientVideo(
       '-filter_complex', filterComplex,
       '-map', `[${currentInput}]`,
       '-map', '[final_audio]',
-      '-c:v', 'libx264',
+      ...encoder.codecArgs,
       '-c:a', 'aac',
-      '-preset', 'fast',
-      '-crf', '20',
-      '-profile:v', 'high',
-      '-level', '4.1',
-      '-pix_fmt', 'yuv420p',
       '-movflags', '+faststart',
       '-r', '30',
       '-b:a', '128k', // Efficient audio bitrate
@@ -386,13 +432,17 @@ async function composeEfficientVideo(
     );
 
     console.log('🔧 Starting efficient FFmpeg composition...');
-    console.log('[BG] final background path ->', backgroundPath);
+    console.log('[BG] final background path ->', backgroundPath || 'lavfi color');
     console.log(`📊 Processing ${wordTimestamps.length} animated captions`);
     console.log(`🎵 Audio: ${openingDuration.toFixed(1)}s opening + ${storyDuration.toFixed(1)}s story`);
     console.log(`🎨 Font: ${fontPath || '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'}`);
 
     const ffmpeg = spawn('ffmpeg', ffmpegArgs);
     
+    // FFmpeg may exit before draining stdin on failure; the close handler reports that
+    ffmpeg.stdin.on('error', () => {});
+    ffmpeg.stdin.end(bannerPng);
+    
     let stderrOutput = '';
 
     ffmpeg.stderr.on('data', (data) => {
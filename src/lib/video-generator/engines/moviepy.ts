@@ -7,12 +7,22 @@ import path from 'path';
 import fs from 'fs/promises';
 import os from 'os';
 
+let moviePyAvailability: Promise<boolean> | null = null;
+
 export class MoviePyEngine implements IVideoEngine {
   name(): "moviepy" {
     return "moviepy";
   }
 
   async isAvailable(): Promise<boolean> {
+    // Importing whisper and moviepy takes seconds; probe once per process
+    if (!moviePyAvailability) {
+      moviePyAvailability = this.probePython();
+    }
+    return moviePyAvailability;
+  }
+
+  private async probePython(): Promise<boolean> {
     try {
       // Check if Python virtual environment is available
       if (process.env.VERCEL) {
@@ -124,12 +134,9 @@ export class MoviePyEngine implements IVideoEngine {
         const bannerPath = await this.createBanner(jobConfig);
         await updateProgress(jobId, 50);
 
-        // Generate final video
-        const outputPath = await this.generateVideo(jobConfig, bannerPath);
-        await updateProgress(jobId, 90);
-
-        // Move to public directory
-        const finalPath = await this.moveToPublic(outputPath, jobId);
+        // Generate final video straight into the directory /api/videos serves from
+        const finalPath = path.join(tmpDir, `output_${jobId}.mp4`);
+        await this.generateVideo(jobConfig, bannerPath, finalPath);
         await updateProgress(jobId, 100);
 
         console.log('✅ MoviePy video generation completed');
@@ -190,8 +197,10 @@ export class MoviePyEngine implements IVideoEngine {
     return bannerPath;
   }
 
-  private async generateVideo(jobConfig: JobConfig, bannerPath: string): Promise<string> {
-    const outputPath = path.join(path.dirname(jobConfig.ttsPath), `output_${jobConfig.jobId}.mp4`);
+  private async generateVideo(jobConfig: JobConfig, bannerPath: string, finalPath: string): Promise<string> {
+    // Render next to the final file so publishing is a same-directory rename;
+    // keep the .mp4 extension because MoviePy picks the container from it
+    const outputPath = finalPath.replace(/\.mp4$/, '.tmp.mp4');
     const videoScriptPath = path.join(process.cwd(), 'src', 'python', 'enhanced_generate_video.py');
     
     // Create enhanced Python script arguments
@@ -251,36 +260,14 @@ export class MoviePyEngine implements IVideoEngine {
       pythonProcess.on('error', (err) => {
         reject(new Error(`Failed to start video generation: ${err.message}`));
       });
+    }).catch(async (error) => {
+      await fs.unlink(outputPath).catch(() => {}); // Ignore cleanup errors
+      throw error;
     });
 
-    return outputPath;
-  }
-
-  private async moveToPublic(tempPath: string, jobId: string): Promise<string> {
-    // The /api/videos endpoint looks for files in the temp directory
-    const tmpDir = process.env.VERCEL ? '/tmp' : os.tmpdir();
-    const finalPath = path.join(tmpDir, `output_${jobId}.mp4`);
-    
-    console.log(`📁 Moving video from ${tempPath} to ${finalPath}`);
-    
-    try {
-      await fs.rename(tempPath, finalPath);
-      console.log('✅ Video file moved successfully via rename');
-    } catch (error) {
-      // If rename fails, copy and delete
-      console.log('⚠️ Rename failed, trying copy:', error);
-      await fs.copyFile(tempPath, finalPath);
-      await fs.unlink(tempPath).catch(() => {}); // Ignore cleanup errors
-      console.log('✅ Video file moved successfully via copy');
-    }
-    
-    // Verify the file exists at the final location
-    const finalExists = await fs.access(finalPath).then(() => true).catch(() => false);
-    if (!finalExists) {
-      throw new Error(`Failed to move video file to final location: ${finalPath}`);
-    }
-    
-    console.log(`✅ Video file verified at final location: ${finalPath}`);
+    // Atomic publish: readers never see a partially written video
+    await fs.rename(outputPath, finalPath);
+    console.log(`✅ Video published at ${finalPath}`);
     return finalPath;
   }
-} 
\ No newline at end of file
+}
@@ -7,9 +7,19 @@ import { generateVideo as generateNodeVideo } from './node-generator';
 import path from 'path';
 import fs from 'fs/promises';
 import os from 'os';
+import { spawn } from 'child_process';
 
-// Test if Python video generation is available
-async function testPythonAvailability(): Promise<boolean> {
+let pythonAvailability: Promise<boolean> | null = null;
+
+// Test if Python video generation is available; the import check runs once per process
+function testPythonAvailability(): Promise<boolean> {
+  if (!pythonAvailability) {
+    pythonAvailability = probePython();
+  }
+  return pythonAvailability;
+}
+
+async function probePython(): Promise<boolean> {
   try {
     console.log('Testing Python video generation availability...');
     
@@ -21,7 +31,6 @@ async function testPythonAvailability(): Promise<boolean> {
     
     // On localhost, try to use the venv Python and test for whisper module
     console.log('Running on localhost - checking for Python');
-    const { spawn } = require('child_process');
     
     // Use the same Python path as moviepy-generator
     const pythonPath = path.join(process.cwd(), 'venv', 'bin', 'python3');
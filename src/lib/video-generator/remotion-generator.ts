@@ -1,6 +1,7 @@
 import { join } from 'path';
 import { tmpdir } from 'os';
 import { existsSync, writeFileSync } from 'fs';
+import { access, copyFile, rename } from 'fs/promises';
 // Import types only, not runtime modules
 // import type { RenderRequest, RenderResult } from '../../../packages/shared/types';
 import { updateProgress } from './status';
@@ -234,7 +235,6 @@ export class RemotionVideoGenerator {
 	private async createFallbackRender(props: { id: string; bannerPng: string; bgVideo: string; narrationWav: string; alignment: any; fps: number; width: number; height: number; }) {
 		const outputPath = join(this.tempDir, `fallback_render_${props.id}.mp4`);
 		try {
-			const { copyFile } = await import('fs/promises');
 			await copyFile(props.bgVideo, outputPath);
 			console.log(`✅ Created fallback render: ${outputPath}`);
 			return outputPath;
@@ -244,7 +244,6 @@ export class RemotionVideoGenerator {
 	}
 	
 	private async moveToFinalLocation(tempPath: string, jobId: string): Promise<string> {
-		const { rename, access } = await import('fs/promises');
 		const finalPath = join(this.tempDir, `output_${jobId}.mp4`);
 		try {
 			await access(tempPath);
@@ -10,70 +10,129 @@ function getTmpDir(): string {
 
 const STATUS_DIR = path.join(getTmpDir(), 'status');
 
-// Create status directory if it doesn't exist
+// Last status seen per video, tagged with the file's mtime. Polls only re-read
+// and re-parse the JSON when the file has changed since it was cached.
+const STATUS_CACHE_MAX = 4096;
+const statusCache = new Map<string, { mtimeMs: number; status: any }>();
+
+function cacheStatus(videoId: string, mtimeMs: number, status: any) {
+  statusCache.delete(videoId);
+  statusCache.set(videoId, { mtimeMs, status });
+  if (statusCache.size > STATUS_CACHE_MAX) {
+    statusCache.delete(statusCache.keys().next().value as string);
+  }
+}
+
+// Create status directory if it doesn't exist (once per process)
+let statusDirReady: Promise<unknown> | null = null;
 async function ensureStatusDir() {
-  await fs.mkdir(STATUS_DIR, { recursive: true });
+  if (!statusDirReady) {
+    statusDirReady = fs.mkdir(STATUS_DIR, { recursive: true });
+    statusDirReady.catch(() => { statusDirReady = null; });
+  }
+  await statusDirReady;
 }
 
-export async function createVideoStatus(videoId: string) {
+let tmpWriteCounter = 0;
+
+async function writeStatus(videoId: string, status: any) {
   await ensureStatusDir();
   const statusFile = path.join(STATUS_DIR, `${videoId}.json`);
-  await fs.writeFile(statusFile, JSON.stringify({
+  // Write to a temp file and rename over the old one so a concurrent poll never
+  // reads a truncated or half-written status
+  const tmpFile = `${statusFile}.${process.pid}.${++tmpWriteCounter}.tmp`;
+  try {
+    await fs.writeFile(tmpFile, JSON.stringify(status));
+  } catch (error) {
+    if (!(error instanceof Error && 'code' in error && error.code === 'ENOENT')) throw error;
+    // The tmp dir was cleaned out from under us; recreate it and retry once
+    statusDirReady = null;
+    await ensureStatusDir();
+    await fs.writeFile(tmpFile, JSON.stringify(status));
+  }
+  // rename keeps the mtime, so stat our own temp file: stat'ing statusFile after the
+  // rename could pick up another writer's file and cache our payload under its mtime
+  let mtimeMs: number;
+  try {
+    ({ mtimeMs } = await fs.stat(tmpFile));
+    await fs.rename(tmpFile, statusFile);
+  } catch (error) {
+    // Nothing else would ever remove the orphaned temp file
+    await fs.unlink(tmpFile).catch(() => {});
+    throw error;
+  }
+  cacheStatus(videoId, mtimeMs, status);
+}
+
+export async function createVideoStatus(videoId: string) {
+  await writeStatus(videoId, {
     status: 'generating',
     progress: 0,
     createdAt: Date.now()
-  }));
+  });
 }
 
 export async function setVideoGenerating(videoId: string) {
-  await ensureStatusDir();
-  const statusFile = path.join(STATUS_DIR, `${videoId}.json`);
-  await fs.writeFile(statusFile, JSON.stringify({
+  await writeStatus(videoId, {
     status: 'generating',
     progress: 0,
     createdAt: Date.now()
-  }));
+  });
 }
 
+// Progress ticks closer together than this are coalesced into the next write;
+// 100% and the ready/failed transitions are always written
+const PROGRESS_WRITE_INTERVAL_MS = 1000;
+const lastProgressWrite = new Map<string, number>();
+
 export async function updateProgress(videoId: string, progress: number) {
-  await ensureStatusDir();
-  const statusFile = path.join(STATUS_DIR, `${videoId}.json`);
+  const now = Date.now();
+  if (progress < 100 && now - (lastProgressWrite.get(videoId) ?? 0) < PROGRESS_WRITE_INTERVAL_MS) {
+    return;
+  }
+  lastProgressWrite.set(videoId, now);
   const status = await getVideoStatus(videoId);
-  await fs.writeFile(statusFile, JSON.stringify({
+  await writeStatus(videoId, {
     ...status,
     progress
-  }));
+  });
 }
 
 export async function setVideoReady(videoId: string, videoUrl: string) {
-  await ensureStatusDir();
-  const statusFile = path.join(STATUS_DIR, `${videoId}.json`);
-  await fs.writeFile(statusFile, JSON.stringify({
+  lastProgressWrite.delete(videoId);
+  await writeStatus(videoId, {
     status: 'ready',
     progress: 100,
     videoUrl,
     completedAt: Date.now()
-  }));
+  });
 }
 
 export async function setVideoFailed(videoId: string, error: string) {
-  await ensureStatusDir();
-  const statusFile = path.join(STATUS_DIR, `${videoId}.json`);
-  await fs.writeFile(statusFile, JSON.stringify({
+  lastProgressWrite.delete(videoId);
+  await writeStatus(videoId, {
     status: 'failed',
     error,
     failedAt: Date.now()
-  }));
+  });
 }
 
 export async function getVideoStatus(videoId: string) {
   await ensureStatusDir();
   const statusFile = path.join(STATUS_DIR, `${videoId}.json`);
   try {
+    const { mtimeMs } = await fs.stat(statusFile);
+    const cached = statusCache.get(videoId);
+    if (cached && cached.mtimeMs === mtimeMs) {
+      return cached.status;
+    }
     const data = await fs.readFile(statusFile, 'utf-8');
-    return JSON.parse(data);
+    const status = JSON.parse(data);
+    cacheStatus(videoId, mtimeMs, status);
+    return status;
   } catch (error) {
     if (error instanceof Error && 'code' in error && error.code === 'ENOENT') {
+      statusCache.delete(videoId);
       return { status: 'not_found' };
     }
     throw error;
@@ -94,6 +153,7 @@ export async function cleanupOldStatus(): Promise<void> {
         const stats = await fs.stat(filePath);
         if (now - stats.mtimeMs > DAY_IN_MS) {
           await fs.unlink(filePath);
+          statusCache.delete(path.basename(file, '.json'));
         }
       })
     );